@@ -0,0 +1,22 @@
+"""
+One-shot database setup, run it once before starting the API:
+
+    python -m init_db
+"""
+import asyncio
+from database import Base, engine
+# importing models registers the tables on Base
+import models  # noqa: F401  pylint: disable=unused-import
+
+
+async def init_db():
+    """
+    Create the missing tables in the configured database.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(init_db())
@@ -3,320 +3,557 @@ FastAPI Movie API
 """
 
 import os
-import traceback
+import time
+import asyncio
+import logging
+from typing import List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 import httpx
-from fastapi import FastAPI, Depends
-from fastapi.responses import JSONResponse
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from fastapi import FastAPI, Depends, Request, Query, HTTPException
+from fastapi.responses import ORJSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from dotenv import load_dotenv
-from database import get_db, Base, DATABASE_URL
+from database import get_db
 from models import Movie, Comment
-from schemas import MovieCreate, CommentCreate, MovieResponse, CommentUpdate
+from schemas import (
+    MovieCreate, CommentCreate, MovieResponse, CommentUpdate, CommentResponse,
+    MovieDetailResponse, IdResponse, MovieBulkResponse, CommentBulkResponse,
+    MessageResponse, Envelope, PageEnvelope
+)
 
 
 load_dotenv()
 OMDB_API_KEY = os.getenv('OMDB_API_KEY')
 OMDB_API_URL = "http://www.omdbapi.com/"
+OMDB_AUTH_PARAMS = {"apikey": OMDB_API_KEY}  # built once, merged into every lookup
+OMDB_CACHE_TTL = 600  # seconds
+OMDB_CACHE_SIZE = 1024
+OMDB_CONCURRENCY = 20  # matches the shared client's keep-alive pool
+
+logger = logging.getLogger("movie")
+
+# lowercased title -> (expires_at, OMDB payload), oldest entry first
+omdb_cache = OrderedDict()
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """
+    Open one shared OMDB http client for the app lifetime,
+    so every movie lookup reuses the same keep-alive connection.
+    """
+    application.state.http = httpx.AsyncClient(
+        base_url=OMDB_API_URL,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+    yield
+    await application.state.http.aclose()
 
 
 app = FastAPI(title="Movie API",
-              description="FastAPI CRUD for Movies and Comments")
+              description="FastAPI CRUD for Movies and Comments",
+              default_response_class=ORJSONResponse,
+              lifespan=lifespan)
 
 STATUS_SUCCESS = "success"
 STATUS_FAILED = "fail"
 CREATE_SUCCESS_STATUS_CODE = 201
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 200
+
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(_request: Request, exc: StarletteHTTPException):
+    """
+    Wrap HTTP errors (404s raised by the handlers, unknown routes...) in the API response shape.
+    """
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={
+            "status": STATUS_FAILED,
+            "message": exc.detail
+        },
+        headers=getattr(exc, "headers", None)
+    )
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(_request: Request, _exc: Exception):
+    """
+    Answer any error a handler did not deal with in the API response shape.
+    The error itself is not logged here: Starlette re-raises it after this
+    response and the server logs the traceback. Its text stays out of the
+    response, DB errors carry the SQL and its parameters.
+    """
+    return ORJSONResponse(
+        status_code=500,
+        content={
+            "status": STATUS_FAILED,
+            "message": "Internal server error"
+        }
+    )
+
 
+async def fetch_omdb(http: httpx.AsyncClient, movie_title: str) -> dict:
+    """
+    Look a movie up on OMDB by title, serving repeated titles from an in-process
+    TTL/LRU cache. Only found movies are cached, OMDB metadata does not change.
+    """
+    key = movie_title.strip().lower()
+    now = time.monotonic()
+    cached = omdb_cache.get(key)
+    if cached and cached[0] > now:
+        omdb_cache.move_to_end(key)
+        return cached[1]
+
+    response = await http.get("", params={**OMDB_AUTH_PARAMS, "t": movie_title.strip()})
+    data = response.json()
+    logger.debug("omdb response: %s", data)
+
+    if data.get("Response") == "True":
+        omdb_cache[key] = (now + OMDB_CACHE_TTL, data)
+        omdb_cache.move_to_end(key)
+        if len(omdb_cache) > OMDB_CACHE_SIZE:
+            omdb_cache.popitem(last=False)
+    return data
+
+
+def parse_omdb_year(data: dict) -> Optional[int]:
+    """
+    Read the release year of an OMDB result, None when it isn't a single year
+    (series come back with a range such as "2004–2010").
+    """
+    try:
+        return int(data["Year"])
+    except (KeyError, ValueError):
+        return None
+
+
+def fits_movie_columns(title: str, genre: Optional[str]) -> bool:
+    """
+    Tell whether an OMDB title and genre fit the movies columns as they are.
+    """
+    return (len(title) <= Movie.title.type.length
+            and len(genre or "") <= Movie.genre.type.length)
 
-# it's creating talbles in database automatically
-engine = create_engine(DATABASE_URL)
-Base.metadata.create_all(bind=engine)
 
+def upsert_movie_query(dialect_name: str, values: dict):
+    """
+    Build the insert-or-reuse statement for one movie, see upsert_movie.
+    """
+    if dialect_name == "mysql":
+        # LAST_INSERT_ID(id) hands the existing row's id back as lastrowid
+        query = mysql_insert(Movie).values(**values)
+        return query.on_duplicate_key_update(id=func.last_insert_id(Movie.id))
 
-@app.post("/movies", response_model=MovieCreate)
-def create_movie(movie_title: str, db: Session = Depends(get_db)):
+    # sqlite, used by the test-suite
+    query = sqlite_insert(Movie).values(**values)
+    return query.on_conflict_do_update(
+        index_elements=[Movie.title, Movie.year], set_={"title": query.excluded.title}
+    ).returning(Movie.id)
+
+
+def insert_movies_query(dialect_name: str, rows: List[dict]):
+    """
+    Build the multi-row insert for many movies, see insert_movies.
+    On MySQL INSERT IGNORE downgrades every error to a warning, not only duplicate
+    keys: a value too long for its column would be silently truncated. Callers
+    must check rows with fits_movie_columns first.
+    """
+    if dialect_name == "mysql":
+        # ON DUPLICATE KEY would count matched rows too (CLIENT_FOUND_ROWS),
+        # INSERT IGNORE reports only the inserted ones
+        return mysql_insert(Movie).values(rows).prefix_with("IGNORE")
+
+    # sqlite, used by the test-suite
+    return sqlite_insert(Movie).values(rows).on_conflict_do_nothing()
+
+
+async def upsert_movie(db: AsyncSession, values: dict) -> int:
+    """
+    Insert a movie, or reuse the existing row with the same title and year,
+    in one statement and return its id.
+    Relies on uq_movies_title_year being present in the database.
+    """
+    dialect_name = db.bind.dialect.name
+    result = await db.execute(upsert_movie_query(dialect_name, values))
+    if dialect_name == "mysql":
+        return result.lastrowid
+    return result.scalar_one()
+
+
+async def insert_movies(db: AsyncSession, rows: List[dict]) -> int:
+    """
+    Insert many movies with one multi-row INSERT, skipping title/year pairs
+    that are already stored, and return how many rows were actually inserted.
+    Relies on uq_movies_title_year being present in the database.
+    """
+    result = await db.execute(insert_movies_query(db.bind.dialect.name, rows))
+    return result.rowcount
+
+
+async def update_by_id(db: AsyncSession, model, row_id: int, values: dict, columns: tuple):
+    """
+    Update a row by primary key with a single UPDATE statement and return the
+    requested columns, or None if no row matched.
+    MySQL has no UPDATE ... RETURNING, there the row is read back by primary key.
+    """
+    if not values:
+        result = await db.execute(select(*columns).where(model.id == row_id))
+        return result.mappings().first()
+
+    query = update(model).where(model.id == row_id).values(**values)
+    if db.bind.dialect.update_returning:
+        result = await db.execute(query.returning(*columns))
+        return result.mappings().first()
+
+    result = await db.execute(query)
+    if result.rowcount == 0:
+        return None
+    result = await db.execute(select(*columns).where(model.id == row_id))
+    return result.mappings().first()
+
+
+@app.post("/movies", response_model=Envelope[IdResponse])
+async def create_movie(movie_title: str, request: Request, db: AsyncSession = Depends(get_db)):
     """
         Fetch movie details from the OMDB API and store them in the database.
         Args:
             movie_title (str): Title of the movie to fetch.
-            db (Session): SQLAlchemy database session.
+            request (Request): Incoming request, used to reach the shared OMDB client.
+            db (AsyncSession): SQLAlchemy async database session.
         Returns:
-            JSONResponse: Movie creation status and ID if successful.
+            dict: Movie creation status and ID if successful.
     """
-    try:
-        response = httpx.get(f"{OMDB_API_URL}?t={movie_title}&apikey={OMDB_API_KEY}")
-        data = response.json()
-        print(F"founded data : {data}")
+    data = await fetch_omdb(request.app.state.http, movie_title)
+
+    if data.get("Response") == "False":
+        raise HTTPException(status_code=404, detail="Movie not found")
+    year = parse_omdb_year(data)
+    if year is None:
+        raise HTTPException(status_code=422, detail="Movie year could not be read")
+    movie_id = await upsert_movie(
+        db, {"title": data["Title"], "genre": data["Genre"], "year": year})
+    await db.commit()
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Added movie successfully !!",
+        "data": {
+            "id": movie_id
+        }
+    }
+
 
+@app.post("/movies/bulk", response_model=Envelope[MovieBulkResponse])
+async def create_movies_bulk(movie_titles: List[str], request: Request,
+                             db: AsyncSession = Depends(get_db)):
+    """
+        Fetch many movies from the OMDB API concurrently and store them with one insert.
+        Args:
+            movie_titles (List[str]): Titles of the movies to fetch.
+            request (Request): Incoming request, used to reach the shared OMDB client.
+            db (AsyncSession): SQLAlchemy async database session.
+        Returns:
+            dict: Number of new movies inserted, the titles OMDB did not find, the ones
+                whose OMDB year could not be read or whose title/genre is too long
+                to store, and the ones whose lookup failed.
+    """
+    # one lookup per distinct title, at most OMDB_CONCURRENCY in flight
+    titles = list({
+        title.strip().lower(): title.strip() for title in movie_titles if title.strip()
+    }.values())
+    semaphore = asyncio.Semaphore(OMDB_CONCURRENCY)
+
+    async def fetch(title):
+        async with semaphore:
+            return await fetch_omdb(request.app.state.http, title)
+
+    # one failed lookup (timeout, non-JSON reply...) must not sink the others
+    results = await asyncio.gather(*(fetch(title) for title in titles), return_exceptions=True)
+
+    # different titles can resolve to the same OMDB movie, keep one row per title/year
+    movies = {}
+    not_found = []
+    unparsable = []
+    failed = []
+    for title, data in zip(titles, results):
+        if isinstance(data, BaseException):
+            logger.warning("omdb lookup for %r failed: %r", title, data)
+            failed.append(title)
+            continue
         if data.get("Response") == "False":
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": STATUS_FAILED,
-                    "message": "Movie not found",
-                    "data": None
-                }
-            )
-        new_movie = Movie(
-            title=data["Title"], genre=data["Genre"], year=int(data["Year"]))
-        db.add(new_movie)
-        db.commit()
-        db.refresh(new_movie)
-        return JSONResponse(
-            status_code=200,
-            content={
-                "status": STATUS_SUCCESS,
-                "message": "Added movie successfully !!",
-                "data": {
-                    "id": new_movie.id
-                }
-            }
-        )
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
-        )
+            not_found.append(title)
+            continue
+        year = parse_omdb_year(data)
+        if year is None or not fits_movie_columns(data["Title"], data["Genre"]):
+            unparsable.append(title)
+            continue
+        movies[(data["Title"], year)] = {
+            "title": data["Title"], "genre": data["Genre"], "year": year
+        }
+
+    inserted = 0
+    if movies:
+        inserted = await insert_movies(db, list(movies.values()))
+        await db.commit()
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Added movies successfully !!",
+        "data": {
+            "inserted": inserted,
+            "not_found": not_found,
+            "unparsable": unparsable,
+            "failed": failed
+        }
+    }
 
 
-@app.get("/movies")
-def read_movies(genre: str = None, year: int = None, db: Session = Depends(get_db)):
+@app.get("/movies", response_model=PageEnvelope[List[MovieResponse]])
+async def read_movies(genre: str = None, year: int = None,
+                      limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+                      after_id: int = None, db: AsyncSession = Depends(get_db)):
     """
     Retrieve movies with optional genre and year filters.
+    Results are keyset paginated by id: pass the returned next_cursor as
+    after_id to fetch the next page, until next_cursor is null.
     """
-    try:
-        query = db.query(Movie)
-        print(F"year : {year}")
-        if genre:
-            query = query.filter(Movie.genre.ilike(f"%{genre}%"))
-        if year:
-            query = query.filter(Movie.year == year)
-
-        movies = query.all()
-        # Map the movies to the required data format
-        mapped_data = [
-            {
-                "id": movie.id,
-                "title": movie.title,
-                "genre": movie.genre,
-                "year": movie.year
-            } for movie in movies
-        ]
-        return JSONResponse(
-            status_code=200,
-            content={
-                "status": STATUS_SUCCESS,
-                "message": "Get movies list successfully!",
-                "data": mapped_data
-            }
-        )
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
-        )
+    # Select only the columns we return, rows come back without ORM hydration
+    query = select(Movie.id, Movie.title, Movie.genre, Movie.year)
+    if genre:
+        query = query.where(func.lower(Movie.genre).like(f"%{genre.lower()}%"))
+    if year:
+        query = query.where(Movie.year == year)
+    if after_id:
+        query = query.where(Movie.id > after_id)
+    query = query.order_by(Movie.id).limit(limit)
+
+    result = await db.execute(query)
+    mapped_data = [dict(row) for row in result.mappings()]
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Get movies list successfully!",
+        "data": mapped_data,
+        "next_cursor": mapped_data[-1]["id"] if len(mapped_data) == limit else None
+    }
+
+
+@app.get("/movies/{movie_id}", response_model=Envelope[MovieDetailResponse])
+async def read_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Retrieve a single movie along with its comments.
+
+    Args:
+        movie_id (int): The ID of the movie to fetch.
+        db (AsyncSession): The async database session.
+
+    Returns:
+        dict: The movie detail with its comments list.
+    """
+    # comments are loaded with one extra IN query instead of one per access
+    result = await db.execute(
+        select(Movie).where(Movie.id == movie_id).options(selectinload(Movie.comments))
+    )
+    movie = result.scalars().first()
+    if movie is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Get movie detail successfully!",
+        "data": {
+            "id": movie.id,
+            "title": movie.title,
+            "genre": movie.genre,
+            "year": movie.year,
+            "comments": [
+                {
+                    "id": comment.id,
+                    "comment": comment.comment,
+                    "movie_id": comment.movie_id
+                } for comment in movie.comments
+            ]
+        }
+    }
 
 
-@app.put("/movies/{movie_id}")
-def update_movie(movie_id: int, movie_data: MovieCreate, db: Session = Depends(get_db)):
+@app.put("/movies/{movie_id}", response_model=Envelope[MovieResponse])
+async def update_movie(movie_id: int, movie_data: MovieCreate, db: AsyncSession = Depends(get_db)):
     """
     Update an existing movie in the database by movie ID.
 
     Args:
         movie_id (int): The ID of the movie to update.
         movie_data (MovieCreate): The movie data to update with.
-        db (Session): The database session.
+        db (AsyncSession): The async database session.
 
     Returns:
         Movie: The updated movie object.
 
     Raises:
-        HTTPException: If the movie is not found or an error occurs.
+        HTTPException: If the movie is not found or another movie has the same title and year.
     """
     try:
-        movie = db.query(Movie).filter(Movie.id == movie_id).first()
-
-        if movie is None:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": STATUS_FAILED,
-                    "message": "Movie not found",
-                }
-            )
-        for key, value in movie_data.dict().items():
-            setattr(movie, key, value)
-        db.commit()
-        db.refresh(movie)
-
-        return JSONResponse(
-            status_code=200,
-            content={
-                "status": STATUS_SUCCESS,
-                "message": "Update movie detail successfully!",
-                "data": MovieResponse.from_orm(movie).dict()
-            }
-        )
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
+        movie = await update_by_id(
+            db, Movie, movie_id, movie_data.model_dump(exclude_unset=True),
+            (Movie.id, Movie.title, Movie.genre, Movie.year)
         )
+    except IntegrityError as exc:
+        # another movie already has this title and year (uq_movies_title_year)
+        await db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Movie with this title and year already exists") from exc
+
+    if movie is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    await db.commit()
 
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Update movie detail successfully!",
+        "data": dict(movie)
+    }
 
-@app.delete("/movies/{movie_id}")
-def delete_movie(movie_id: int, db: Session = Depends(get_db)):
+
+@app.delete("/movies/{movie_id}", response_model=MessageResponse)
+async def delete_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
     """
     Delete a movie from the database by its movie ID.
 
     Args:
         movie_id (int): The ID of the movie to delete.
-        db (Session): The database session.
+        db (AsyncSession): The async database session.
 
     Returns:
-        JSONResponse: A response indicating the result of the deletion.
+        dict: A response indicating the result of the deletion.
     """
-    try:
-        movie = db.query(Movie).filter(Movie.id == movie_id).first()
-        if not movie:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": STATUS_FAILED,
-                    "message": "Movie detail not found"
-                }
-            )
-
-        db.delete(movie)
-        db.commit()
-        data = {
-            "status": STATUS_SUCCESS,
-            "message": "Delete movie detail successfully !!",
-        }
-        return JSONResponse(
-            status_code=200,
-            content=data
-        )
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
-        )
+    # comments go with it through the ON DELETE CASCADE foreign key
+    result = await db.execute(delete(Movie).where(Movie.id == movie_id))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Movie detail not found")
 
+    await db.commit()
+    data = {
+        "status": STATUS_SUCCESS,
+        "message": "Delete movie detail successfully !!",
+    }
+    return data
 
-@app.post("/comments", response_model=CommentCreate)
-def create_comment(comment: CommentCreate, db: Session = Depends(get_db)):
+
+@app.post("/comments", response_model=Envelope[IdResponse])
+async def create_comment(comment: CommentCreate, db: AsyncSession = Depends(get_db)):
     """
     Create a new comment for a movie.
 
     Args:
         comment (CommentCreate): The comment data to create.
-        db (Session): The database session.
+        db (AsyncSession): The async database session.
 
     Returns:
-        JSONResponse: A response containing the status and created comment ID.
+        dict: A response containing the status and created comment ID.
+
+    Raises:
+        HTTPException: If the movie the comment refers to does not exist.
     """
+    # the new id comes back with the INSERT itself (LAST_INSERT_ID on MySQL),
+    # no refresh SELECT needed
     try:
-        comment = Comment(**comment.dict())
-        db.add(comment)
-        db.commit()
-        db.refresh(comment)
-        data = {
-            "status": STATUS_SUCCESS,
-            "message": "Added movie comment successfully !!",
-            "data": {
-                "id": comment.id
-            }
+        result = await db.execute(insert(Comment).values(**comment.model_dump()))
+    except IntegrityError as exc:
+        # movie_id doesn't reference an existing movie
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Movie not found") from exc
+    await db.commit()
+    data = {
+        "status": STATUS_SUCCESS,
+        "message": "Added movie comment successfully !!",
+        "data": {
+            "id": result.inserted_primary_key[0]
         }
-        return JSONResponse(
-            status_code=200,
-            content=data
-        )
+    }
+    return data
 
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
-        )
 
-
-@app.get("/comments")
-def read_comments(comment: str = None, movie_id: int = None, db: Session = Depends(get_db)):
+@app.post("/comments/bulk", response_model=Envelope[CommentBulkResponse])
+async def create_comments_bulk(comments: List[CommentCreate], db: AsyncSession = Depends(get_db)):
     """
-    Retrieve comments with optional comment and movie_id filters.
+    Create many comments in a single transaction.
+
+    Args:
+        comments (List[CommentCreate]): The comments data to create.
+        db (AsyncSession): The async database session.
+
+    Returns:
+        dict: A response containing the status and number of inserted comments.
+
+    Raises:
+        HTTPException: If a movie one of the comments refers to does not exist.
     """
-    try:
-        query = db.query(Comment)
-        if comment:
-            query = query.filter(Comment.comment.ilike(f"%{comment}%"))
-        if movie_id:
-            query = query.filter(Comment.movie_id == movie_id)
-
-        comments = query.all()
-
-        # Map the comments to the required data format
-        mapped_data = [
-            {
-                "id": comment.id,
-                "comment": comment.comment,
-                "movie_id": comment.movie_id
-            } for comment in comments
-        ]
-
-        return JSONResponse(
-            status_code=200,
-            content={
-                "status": STATUS_SUCCESS,
-                "message": "Get comments list successfully!",
-                "data": mapped_data
-            }
-        )
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
-        )
+    if comments:
+        # one executemany INSERT, skipping the per-object unit of work
+        try:
+            await db.execute(insert(Comment), [comment.model_dump() for comment in comments])
+        except IntegrityError as exc:
+            # a movie_id doesn't reference an existing movie, nothing is inserted
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="Movie not found") from exc
+        await db.commit()
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Added movie comments successfully !!",
+        "data": {
+            "inserted": len(comments)
+        }
+    }
 
 
-@app.put("/comments/{comment_id}")
-def update_comment(comment_id: int, comment_data: CommentUpdate, db: Session = Depends(get_db)):
+@app.get("/comments", response_model=PageEnvelope[List[CommentResponse]])
+async def read_comments(comment: str = None, movie_id: int = None,
+                        limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+                        after_id: int = None, db: AsyncSession = Depends(get_db)):
+    """
+    Retrieve comments with optional comment and movie_id filters.
+    Results are keyset paginated by id: pass the returned next_cursor as
+    after_id to fetch the next page, until next_cursor is null.
+    """
+    # Select only the columns we return, rows come back without ORM hydration
+    query = select(Comment.id, Comment.comment, Comment.movie_id)
+    if comment:
+        query = query.where(Comment.comment.ilike(f"%{comment}%"))
+    if movie_id:
+        query = query.where(Comment.movie_id == movie_id)
+    if after_id:
+        query = query.where(Comment.id > after_id)
+    query = query.order_by(Comment.id).limit(limit)
+
+    result = await db.execute(query)
+    mapped_data = [dict(row) for row in result.mappings()]
+
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Get comments list successfully!",
+        "data": mapped_data,
+        "next_cursor": mapped_data[-1]["id"] if len(mapped_data) == limit else None
+    }
+
+
+@app.put("/comments/{comment_id}", response_model=Envelope[CommentResponse])
+async def update_comment(comment_id: int, comment_data: CommentUpdate,
+                         db: AsyncSession = Depends(get_db)):
     """
     Update an existing comment in the database by comment ID.
 
     Args:
         comment_id (int): The ID of the comment to update.
         comment_data (CommentCreate): The comment data to update with.
-        db (Session): The database session.
+        db (AsyncSession): The async database session.
 
     Returns:
         comment: The updated comment object.
@@ -324,92 +561,42 @@ def update_comment(comment_id: int, comment_data: CommentUpdate, db: Session = D
     Raises:
         HTTPException: If the comment is not found or an error occurs.
     """
-    try:
-        # Corrected query syntax
-        comment = db.query(Comment).filter(Comment.id == comment_id).first()
-
-        if not comment:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": STATUS_FAILED,
-                    "message": "Comment not found",  # Fixed message: "Movie" -> "Comment"
-                }
-            )
-
-        # Update the comment fields
-        for key, value in comment_data.dict().items():
-            setattr(comment, key, value)
-
-        # Commit and refresh the updated comment
-        db.commit()
-        db.refresh(comment)
-
-        # Return updated comment data (you can also use a Pydantic response model here)
-        return JSONResponse(
-            status_code=200,
-            content={
-                "status": STATUS_SUCCESS,
-                "message": "Update comment successfully!",
-                "data": {
-                    "id": comment.id,
-                    "comment": comment.comment,
-                    "movie_id": comment.movie_id
-                }
-            }
-        )
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
-        )
+    # Update the comment fields and read back the updated row in one go
+    comment = await update_by_id(
+        db, Comment, comment_id, comment_data.model_dump(exclude_unset=True),
+        (Comment.id, Comment.comment, Comment.movie_id)
+    )
 
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    await db.commit()
 
-@app.delete("/comments/{comment_id}")
-async def delete_comment(comment_id: int, db: Session = Depends(get_db)):
+    return {
+        "status": STATUS_SUCCESS,
+        "message": "Update comment successfully!",
+        "data": dict(comment)
+    }
+
+
+@app.delete("/comments/{comment_id}", response_model=MessageResponse)
+async def delete_comment(comment_id: int, db: AsyncSession = Depends(get_db)):
     """
     Delete a comment from the database by its comment ID.
 
     Args:
         comment_id (int): The ID of the comment to delete.
-        db (Session): The database session.
+        db (AsyncSession): The async database session.
 
     Returns:
-        JSONResponse: A response indicating the result of the deletion.
+        dict: A response indicating the result of the deletion.
     """
-    try:
-        comment = db.query(Comment).filter(Comment.id == comment_id).first()
-        if not comment:
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": STATUS_FAILED,
-                    "message": "comment detail not found"
-                }
-            )
-
-        db.delete(comment)
-        db.commit()
-        data = {
-            "status": STATUS_SUCCESS,
-            "message": "Delete comment detail successfully !!",
-        }
-        return JSONResponse(
-            status_code=200,
-            content=data
-        )
-    except Exception as e:
-        # Print stack trace for debugging purposes
-        traceback.print_exc()
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": STATUS_FAILED,
-                "message": str(e)
-            }
-        )
+    result = await db.execute(delete(Comment).where(Comment.id == comment_id))
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="comment detail not found")
+
+    await db.commit()
+    data = {
+        "status": STATUS_SUCCESS,
+        "message": "Delete comment detail successfully !!",
+    }
+    return data
@@ -9,7 +9,7 @@
     Relationships:
         - A Comment is associated with a Movie via a foreign key.
 """
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -23,8 +23,18 @@ class Movie(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)  # Added VARCHAR length
     genre = Column(String(100))
-    year = Column(Integer)
-    comments = relationship('Comment', back_populates='movie', cascade='all, delete')
+    year = Column(Integer, index=True)
+    # Keep the default lazy loading here; queries that walk comments opt in with
+    # options(selectinload(Movie.comments)) to avoid N+1 selects and joined-load row explosion
+    comments = relationship('Comment', back_populates='movie', cascade='all, delete',
+                            passive_deletes=True)
+
+    # genre is filtered case-insensitively through lower(genre), index that expression.
+    # A title/year pair is stored once, creating it again reuses the existing row.
+    __table_args__ = (
+        Index('ix_movies_genre_lower', func.lower(genre)),
+        UniqueConstraint('title', 'year', name='uq_movies_title_year'),
+    )
 
 
 class Comment(Base):
@@ -34,6 +44,6 @@ class Comment(Base):
     """
     __tablename__ = 'comments'
     id = Column(Integer, primary_key=True, index=True)
-    movie_id = Column(Integer, ForeignKey('movies.id', ondelete='CASCADE'))
+    movie_id = Column(Integer, ForeignKey('movies.id', ondelete='CASCADE'), index=True)
     comment = Column(String(500))
     movie = relationship('Movie')
@@ -8,28 +8,38 @@ Classes:
     - MovieResponse: Pydantic model for movie response data.
     - CommentCreate: Pydantic model for creating a new comment for a movie.
     - CommentUpdate: Pydantic model for updating an existing comment.
+    - CommentResponse: Pydantic model for comment response data.
+    - MovieDetailResponse: Pydantic model for a movie along with its comments.
+    - IdResponse: Pydantic model for the ID of a created record.
+    - MovieBulkResponse: Pydantic model for the result of a bulk movie creation.
+    - CommentBulkResponse: Pydantic model for the result of a bulk comment creation.
+    - MessageResponse: Pydantic model for a response with only a status and message.
+    - Envelope: Generic Pydantic model wrapping every API response that carries data.
+    - PageEnvelope: Generic Pydantic model wrapping a keyset paginated list.
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, ConfigDict, Field
+
+T = TypeVar("T")
 
 
 class MovieCreate(BaseModel):
     """
     Pydantic model for creating a new movie.
     """
-    title: str = Field(..., example="Inception")
-    genre: Optional[str] = Field(None, example="Action, Sci-Fi")
-    year: Optional[int] = Field(None, example=2010)
+    title: str = Field(..., examples=["Inception"])
+    genre: Optional[str] = Field(None, examples=["Action, Sci-Fi"])
+    year: Optional[int] = Field(None, examples=[2010])
 
 
 class MovieUpdate(BaseModel):
     """
     Pydantic model for updating an existing movie.
     """
-    title: Optional[str] = Field(None, example="Inception")
-    genre: Optional[str] = Field(None, example="Action, Sci-Fi")
-    year: Optional[int] = Field(None, example=2010)
+    title: Optional[str] = Field(None, examples=["Inception"])
+    genre: Optional[str] = Field(None, examples=["Action, Sci-Fi"])
+    year: Optional[int] = Field(None, examples=[2010])
 
 
 class MovieResponse(BaseModel):
@@ -38,19 +48,15 @@ class MovieResponse(BaseModel):
     """
     id: int
     title: str
-    genre: str
-    year: int
+    genre: Optional[str] = None
+    year: Optional[int] = None
 
-    class Config:
-        """
-        config class of movie reesponse    
-        """
-        from_attributes = True
-        orm_mode = True
+    # build straight from ORM objects / result rows through pydantic-core
+    model_config = ConfigDict(from_attributes=True)
 
 
 class CommentCreate(BaseModel):
-    comment: str = Field(..., example="Great movie!")
+    comment: str = Field(..., examples=["Great movie!"])
     movie_id: int
 
 
@@ -58,4 +64,69 @@ class CommentUpdate(BaseModel):
     """
     Pydantic model for updating an existing comment.
     """
-    comment: Optional[str] = Field(None, example="Updated review.")
+    comment: Optional[str] = Field(None, examples=["Updated review."])
+
+
+class CommentResponse(BaseModel):
+    """
+    Pydantic model for comment response data.
+    """
+    id: int
+    comment: Optional[str] = None
+    movie_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MovieDetailResponse(MovieResponse):
+    """
+    Pydantic model for a movie along with its comments.
+    """
+    comments: List[CommentResponse] = []
+
+
+class IdResponse(BaseModel):
+    """
+    Pydantic model for the ID of a created record.
+    """
+    id: int
+
+
+class MovieBulkResponse(BaseModel):
+    """
+    Pydantic model for the result of a bulk movie creation.
+    """
+    inserted: int
+    not_found: List[str] = []
+    unparsable: List[str] = []
+    failed: List[str] = []
+
+
+class CommentBulkResponse(BaseModel):
+    """
+    Pydantic model for the result of a bulk comment creation.
+    """
+    inserted: int
+
+
+class MessageResponse(BaseModel):
+    """
+    Pydantic model for a response that only reports its status and message.
+    """
+    status: str
+    message: str
+
+
+class Envelope(MessageResponse, Generic[T]):
+    """
+    Generic Pydantic model wrapping every API response that carries data.
+    """
+    data: Optional[T] = None
+
+
+class PageEnvelope(Envelope[T], Generic[T]):
+    """
+    Generic Pydantic model wrapping a keyset paginated list,
+    next_cursor is null on the last page.
+    """
+    next_cursor: Optional[int] = None
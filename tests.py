@@ -1,21 +1,41 @@
+import asyncio
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from main import app  # Your FastAPI application instance
+from main import app, fetch_omdb, omdb_cache  # Your FastAPI application instance
+from main import upsert_movie_query, insert_movies_query
 from database import get_db, Base, DATABASE_URL
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from models import Movie, Comment
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-# Setup the testing database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"  # SQLite for testing purposes
+# Setup the testing database, an in-memory SQLite kept in RAM for the whole run
+SQLALCHEMY_DATABASE_URL = "sqlite:///file:testdb?mode=memory&cache=shared&uri=true"
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={
-                       "check_same_thread": False})
+                       "check_same_thread": False}, poolclass=StaticPool)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The app reaches the same in-memory database through the async driver
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///file:testdb?mode=memory&cache=shared&uri=true",
+    connect_args={"check_same_thread": False}, poolclass=StaticPool)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def enable_foreign_keys(dbapi_connection, connection_record):
+    # SQLite leaves foreign keys off, enforce them like MySQL's InnoDB does
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
 Base.metadata.create_all(bind=engine)
 
 # Dependency override for testing
@@ -29,23 +49,37 @@ def db():
         yield db_session
     finally:
         db_session.close()
+        # Empty the tables so rows don't leak into the next test
+        with engine.begin() as connection:
+            for table in reversed(Base.metadata.sorted_tables):
+                connection.execute(table.delete())
 
 
 @pytest.fixture()
 def client():
     # Override the get_db dependency in the FastAPI app
-    def override_get_db():
-        db_session = SessionLocal()
-        try:
+    async def override_get_db():
+        async with AsyncSessionLocal() as db_session:
             yield db_session
-        finally:
-            db_session.close()
 
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture()
+def omdb():
+    # Serve OMDB lookups from the cache so no network call is made,
+    # whatever a test seeds is cleared again at teardown
+    def seed(movie_title, title, genre, year):
+        omdb_cache[movie_title.lower()] = (float("inf"), {
+            "Response": "True", "Title": title, "Genre": genre, "Year": year})
+
+    omdb_cache.clear()
+    yield seed
+    omdb_cache.clear()
+
+
 def test_create_movie(client, db):
     # Test movie creation by title
     response = client.post("/movies", params={"movie_title": "Inception"})
@@ -65,6 +99,144 @@ def test_movie_not_found(client):
     assert data["message"] == "Movie not found"
 
 
+def test_omdb_lookup_is_cached(omdb):
+    # Count the OMDB calls behind a fake transport
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["t"])
+        return httpx.Response(200, json={
+            "Response": "True", "Title": "Inception", "Genre": "Sci-Fi", "Year": "2010"})
+
+    async def lookup_twice():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler),
+                                     base_url="http://omdb.test/") as http:
+            first = await fetch_omdb(http, "Inception")
+            second = await fetch_omdb(http, " inception ")
+        return first, second
+
+    first, second = asyncio.run(lookup_twice())
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_create_movie_reuses_existing_row(client, db, omdb):
+    omdb("Memento", "Memento", "Thriller", "2000")
+
+    # Creating the same movie twice keeps a single row
+    first = client.post("/movies", params={"movie_title": "Memento"})
+    second = client.post("/movies", params={"movie_title": "Memento"})
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.json()["data"]["id"] == second.json()["data"]["id"]
+    assert db.query(Movie).filter(Movie.title == "Memento").count() == 1
+
+
+def test_create_movies_bulk(client, db, omdb):
+    omdb("Heat", "Heat", "Crime", "1995")
+    omdb("Alien", "Alien", "Horror", "1979")
+
+    # Test creating several movies at once, repeated titles are stored once
+    response = client.post("/movies/bulk", json=["Heat", "Alien", "heat"])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "success"
+    assert data["data"]["inserted"] == 2
+    assert db.query(Movie).count() == 2
+
+
+def test_create_movies_bulk_skips_existing(client, db, omdb):
+    # Both titles resolve to the same OMDB movie
+    omdb("Heat", "Heat", "Crime", "1995")
+    omdb("Heat 1995", "Heat", "Crime", "1995")
+
+    response = client.post("/movies/bulk", json=["Heat"])
+    assert response.json()["data"]["inserted"] == 1
+
+    # Re-posting an existing movie inserts nothing new
+    response = client.post("/movies/bulk", json=["Heat", "Heat 1995"])
+    assert response.status_code == 200
+    assert response.json()["data"]["inserted"] == 0
+    assert db.query(Movie).count() == 1
+
+
+def test_create_movies_bulk_reports_unparsable(client, db, omdb):
+    # A series comes back with a year range that can't be stored
+    omdb("Lost", "Lost", "Drama", "2004–2010")
+    omdb("Heat", "Heat", "Crime", "1995")
+
+    # The rest of the batch is still stored
+    # A genre longer than its column is reported rather than truncated
+    omdb("Long", "Long", "Drama, " * 20, "2001")
+    response = client.post("/movies/bulk", json=["Lost", "Heat", "Long"])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["data"]["inserted"] == 1
+    assert data["data"]["unparsable"] == ["Lost", "Long"]
+
+
+def test_create_movies_bulk_reports_failed_lookups(client, db, omdb, monkeypatch):
+    omdb("Heat", "Heat", "Crime", "1995")
+
+    # OMDB answers the uncached title with something that isn't JSON
+    def handler(request):
+        return httpx.Response(502, text="Bad Gateway")
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://omdb.test/")
+    monkeypatch.setattr(app.state, "http", http)
+
+    # The rest of the batch is still stored
+    response = client.post("/movies/bulk", json=["Broken", "Heat"])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["data"]["inserted"] == 1
+    assert data["data"]["failed"] == ["Broken"]
+
+
+def test_mysql_upsert_movie_sql():
+    # Production runs the MySQL statement, the test database can't execute it
+    query = upsert_movie_query("mysql", {"title": "Heat", "genre": "Crime", "year": 1995})
+    assert str(query.compile(dialect=mysql.dialect())) == (
+        "INSERT INTO movies (title, genre, year) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE id = last_insert_id(movies.id)"
+    )
+
+
+def test_mysql_insert_movies_sql():
+    rows = [
+        {"title": "Heat", "genre": "Crime", "year": 1995},
+        {"title": "Alien", "genre": "Horror", "year": 1979},
+    ]
+    query = insert_movies_query("mysql", rows)
+    assert str(query.compile(dialect=mysql.dialect())) == (
+        "INSERT IGNORE INTO movies (title, genre, year) VALUES (%s, %s, %s), (%s, %s, %s)"
+    )
+
+
+def test_create_movie_unreadable_year(client, db, omdb):
+    # A series comes back with a year range that can't be stored
+    omdb("Lost", "Lost", "Drama", "2004–2010")
+
+    response = client.post("/movies", params={"movie_title": "Lost"})
+    assert response.status_code == 422
+    data = response.json()
+    assert data["status"] == "fail"
+    assert data["message"] == "Movie year could not be read"
+
+
+def test_unhandled_error_hides_details(client, monkeypatch):
+    # Break the database dependency to get a real internal failure
+    async def failing_get_db():
+        raise RuntimeError("connection to db-host:3306 refused")
+        yield  # pylint: disable=unreachable
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, failing_get_db)
+    with TestClient(app, raise_server_exceptions=False) as server_client:
+        response = server_client.get("/movies")
+    assert response.status_code == 500
+    assert response.json() == {"status": "fail", "message": "Internal server error"}
+
+
 def test_read_movies(client, db):
     # Add a movie to the database
     movie = Movie(title="Inception", genre="Sci-Fi", year=2010)
@@ -81,6 +253,45 @@ def test_read_movies(client, db):
     assert data["data"][0]["title"] == "Inception"
 
 
+def test_read_movies_pagination(client, db):
+    # Add a few movies to the database
+    movies = [Movie(title=f"Movie {i}", genre="Drama", year=2000 + i) for i in range(3)]
+    db.add_all(movies)
+    db.commit()
+
+    # Walk the list two rows at a time using the returned cursor
+    response = client.get("/movies", params={"genre": "Drama", "limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["data"]) == 2
+    assert data["next_cursor"] == data["data"][-1]["id"]
+
+    response = client.get(
+        "/movies", params={"genre": "Drama", "limit": 2, "after_id": data["next_cursor"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["data"]) == 1
+    assert data["next_cursor"] is None
+
+
+def test_read_movie_with_comments(client, db):
+    # Add a movie with a comment to the database
+    movie = Movie(title="Inception", genre="Sci-Fi", year=2010)
+    db.add(movie)
+    db.commit()
+    db.refresh(movie)
+    db.add(Comment(comment="Great movie!", movie_id=movie.id))
+    db.commit()
+
+    # Test retrieving the movie along with its comments
+    response = client.get(f"/movies/{movie.id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "success"
+    assert data["data"]["title"] == "Inception"
+    assert data["data"]["comments"][0]["comment"] == "Great movie!"
+
+
 def test_update_movie(client, db):
     # Add a movie to the database
     movie = Movie(title="Inception", genre="Sci-Fi", year=2010)
@@ -96,6 +307,21 @@ def test_update_movie(client, db):
     assert data["data"]["title"] == "Interstellar"
 
 
+def test_update_movie_duplicate_title_year(client, db):
+    # Add two movies to the database
+    movie = Movie(title="Inception", genre="Sci-Fi", year=2010)
+    db.add_all([movie, Movie(title="Heat", genre="Crime", year=1995)])
+    db.commit()
+    db.refresh(movie)
+
+    # Renaming onto an existing title/year pair is a conflict
+    response = client.put(f"/movies/{movie.id}", json={"title": "Heat", "year": 1995})
+    assert response.status_code == 409
+    data = response.json()
+    assert data["status"] == "fail"
+    assert data["message"] == "Movie with this title and year already exists"
+
+
 def test_delete_movie(client, db):
     # Add a movie to the database
     movie = Movie(title="Inception", genre="Sci-Fi", year=2010)
@@ -109,6 +335,7 @@ def test_delete_movie(client, db):
     data = response.json()
     assert data["status"] == "success"
     assert data["message"] == "Delete movie detail successfully !!"
+    assert "data" not in data
 
 
 def test_create_comment(client, db):
@@ -127,6 +354,40 @@ def test_create_comment(client, db):
     assert "id" in data["data"]
 
 
+def test_create_comment_unknown_movie(client, db):
+    # Test creating comments for a movie that doesn't exist
+    response = client.post("/comments", json={"comment": "Great movie!", "movie_id": 999})
+    assert response.status_code == 404
+    data = response.json()
+    assert data["status"] == "fail"
+    assert data["message"] == "Movie not found"
+
+    response = client.post("/comments/bulk", json=[{"comment": "Great movie!", "movie_id": 999}])
+    assert response.status_code == 404
+    assert response.json()["message"] == "Movie not found"
+
+
+def test_create_comments_bulk(client, db):
+    # Add a movie to the database
+    movie = Movie(title="Inception", genre="Sci-Fi", year=2010)
+    db.add(movie)
+    db.commit()
+    db.refresh(movie)
+
+    # Test creating several comments at once
+    response = client.post("/comments/bulk", json=[
+        {"comment": "Great movie!", "movie_id": movie.id},
+        {"comment": "Mind bending.", "movie_id": movie.id},
+    ])
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "success"
+    assert data["data"]["inserted"] == 2
+
+    response = client.get("/comments", params={"movie_id": movie.id})
+    assert len(response.json()["data"]) == 2
+
+
 def test_read_comments(client, db):
     # Add a movie to the database
     movie = Movie(title="Inception", genre="Sci-Fi", year=2010)
@@ -193,3 +454,4 @@ def test_delete_comment(client, db):
     data = response.json()
     assert data["status"] == "success"
     assert data["message"] == "Delete comment detail successfully !!"
+    assert "data" not in data